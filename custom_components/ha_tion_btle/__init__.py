@@ -2,31 +2,83 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import fcntl
+import importlib
 import logging
 import math
+import operator
+import os
 import random
+import re
 import time
 from datetime import timedelta
-from functools import cached_property
+from functools import cached_property, partial
+from typing import TYPE_CHECKING
 
 import bleak
-import tion_btle
-from bleak.backends.device import BLEDevice
+from bleak_retry_connector import close_stale_connections_by_address
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import BluetoothCallbackMatcher
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from tion_btle.tion import MaxTriesExceededError, Tion
-
-from .const import CONF_AWAY_TEMP, CONF_KEEP_ALIVE, CONF_MAC, DOMAIN, PLATFORMS, TION_SCHEMA
-
-GLOBAL_BLE_CONNECT_SEM = asyncio.Semaphore(1)
+from tion_btle.tion import MaxTriesExceededError
+
+from .const import (
+    CONF_AWAY_TEMP,
+    CONF_FRESH_TTL,
+    CONF_KEEP_ALIVE,
+    CONF_MAC,
+    CONF_SERIALIZE_ADAPTER,
+    DOMAIN,
+    PLATFORMS,
+    TION_SCHEMA,
+)
+
+if TYPE_CHECKING:
+    import tion_btle
+    from bleak.backends.device import BLEDevice
+    from tion_btle.tion import Tion
+
+# only one LE connect may be in progress on an adapter; breezers on different adapters connect in parallel
+_ADAPTER_CONNECT_LOCKS: dict[str, asyncio.Lock] = {}
 GLOBAL_BLE_STARTUP_LOCK = asyncio.Lock()
 
 _LOGGER = logging.getLogger(__name__)
 
+# tion_btle response normalization: (source key, coordinator data key, converter)
+_decode_on = partial(operator.eq, "on")
+_NORMALIZERS = (
+    ("state", "is_on", _decode_on),
+    ("heater", "heater", _decode_on),
+    ("heating", "is_heating", _decode_on),
+    ("filter_remain", "filter_remain", math.ceil),
+    ("fan_speed", "fan_speed", int),
+)
+
+_NS_IN_S = 1_000_000_000
+# breaker silence for every breaker level
+_BREAKER_NS = tuple(s * _NS_IN_S for s in (15, 45, 120, 300))
+# reconnect delay for 1st, 2nd, 3rd and further failures in a row
+_RECONNECT_DELAYS = tuple(timedelta(seconds=min(10 * 2**i, 60)) for i in range(4))
+
+# keys of coordinator data that change only when breezer is controlled (by us, remote or panel)
+_STATE_KEYS = ("is_on", "heater", "heater_temp", "fan_speed", "mode")
+
+# error message vocabulary, matched case-insensitively in one pass
+_SERVICES_NOT_READY_RE = re.compile(
+    r"service discovery has not been performed yet|services are not ready", re.IGNORECASE
+)
+# "timeout" also covers "handshake timeout"
+_HANDSHAKE_FAILURE_RE = re.compile(
+    r"timeout|services are not ready|service discovery has not been performed|maxtriesexceeded", re.IGNORECASE
+)
+_UPDATE_NEEDS_HARD_RESET_RE = re.compile(r"services are not ready|timeout", re.IGNORECASE)
+_UPDATE_ALREADY_MARKED_RE = re.compile(r"connect timed out|breaker open", re.IGNORECASE)
+_SET_NEEDS_HARD_RESET_RE = re.compile(r"service|timeout", re.IGNORECASE)
+
 
 class _BleakDirectConnectWarningFilter(logging.Filter):
     """Hide the known warning emitted by tion_btle's internal BleakClient.connect()."""
@@ -40,6 +92,40 @@ class _BleakDirectConnectWarningFilter(logging.Filter):
 logging.getLogger("habluetooth.wrappers").addFilter(_BleakDirectConnectWarningFilter())
 
 
+# tion_btle breezer class for every supported model: (module, class name). Module is imported on first use.
+_BREEZER_MODELS: dict[str, tuple[str, str]] = {
+    "S3": ("tion_btle.s3", "TionS3"),
+    "S4": ("tion_btle.s4", "TionS4"),
+    "Lite": ("tion_btle.lite", "TionLite"),
+}
+
+
+_BREEZER_CLASSES: dict[str, type[Tion]] = {}
+
+
+def breezer_class(model: str) -> type[Tion]:
+    """Return tion_btle class for breezer model. Module is imported on first use and cached."""
+    cls = _BREEZER_CLASSES.get(model)
+    if cls is None:
+        try:
+            module, name = _BREEZER_MODELS[model]
+        except KeyError:
+            raise NotImplementedError("Model '%s' is not supported!" % model) from None
+        cls = _BREEZER_CLASSES[model] = getattr(importlib.import_module(module), name)
+    return cls
+
+
+def _adapter_connect_lock(adapter: str) -> asyncio.Lock:
+    lock = _ADAPTER_CONNECT_LOCKS.get(adapter)
+    if lock is None:
+        lock = _ADAPTER_CONNECT_LOCKS[adapter] = asyncio.Lock()
+    return lock
+
+
+def _adapter_lock_path(adapter: str = "hci0") -> str:
+    return f"/run/ha_tion_btle-{adapter}.lock"
+
+
 def _describe_btle_device(device: str | BLEDevice | None) -> str:
     if device is None:
         return "None"
@@ -68,8 +154,20 @@ async def async_setup_entry(hass, config_entry: ConfigEntry):
 
     hass.data.setdefault(DOMAIN, {})
 
+    stale = hass.data[DOMAIN].get(config_entry.entry_id)
+    if stale is not None:
+        # left after failed unload: two Tion objects for one breezer would fight for the only BLE connection
+        _LOGGER.warning("TION_DIAG setup_entry: closing previous instance for %s", config_entry.unique_id)
+        await stale.async_shutdown()
+
+    # first import of tion_btle model module reads files from disk: keep it off the event loop,
+    # TionInstance will get the class from cache
+    await hass.async_add_executor_job(
+        breezer_class, {**config_entry.data, **config_entry.options}.get("model", "S3")
+    )
+
     instance = TionInstance(hass, config_entry)
-    hass.data[DOMAIN][config_entry.unique_id] = instance
+    hass.data[DOMAIN][config_entry.entry_id] = instance
     _LOGGER.warning(
         "TION_DIAG setup_entry instance created: unique_id=%s model=%s keep_alive=%s initial_data=%s",
         instance.unique_id,
@@ -88,6 +186,7 @@ async def async_setup_entry(hass, config_entry: ConfigEntry):
         mode=bluetooth.BluetoothScanningMode.ACTIVE,
     )
     config_entry.async_on_unload(unregister_callback)
+    config_entry.async_on_unload(config_entry.add_update_listener(instance._handle_options_update))
     _LOGGER.warning("TION_DIAG bluetooth callback registered: mac=%s", instance.config[CONF_MAC])
 
     _LOGGER.warning("TION_DIAG forwarding platforms start: platforms=%s", PLATFORMS)
@@ -120,7 +219,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     unload_ok = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
     _LOGGER.warning("TION_DIAG unload platforms result: %s", unload_ok)
 
-    instance = hass.data.get(DOMAIN, {}).pop(config_entry.unique_id, None)
+    instance = hass.data.get(DOMAIN, {}).pop(config_entry.entry_id, None)
     if instance is not None:
         await instance.async_shutdown()
     else:
@@ -136,26 +235,71 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 class TionInstance(DataUpdateCoordinator):
     """Tion instance with persistent BLE connection and auto-reconnect."""
 
+    # DataUpdateCoordinator keeps its __dict__ (cached_property needs it too), so only own state is slotted
+    __slots__ = (
+        "__keep_alive",
+        "__tion",
+        "_adapter_lock_fd",
+        "_breaker_level",
+        "_breaker_until_ns",
+        "_change_ewma_alpha",
+        "_change_ewma_s",
+        "_config_entry",
+        "_connect_lock",
+        "_connected_evt",
+        "_connected_since",
+        "_fail_count",
+        "_fast_polls_left",
+        "_had_successful_update",
+        "_inflight_get",
+        "_inflight_joined",
+        "_initial_settle_s",
+        "_io_lock",
+        "_keep_alive_seconds",
+        "_last_adv_refresh_ts",
+        "_last_btle_device",
+        "_last_change_ts",
+        "_last_result_ts",
+        "_last_state",
+        "_link_lost",
+        "_need_hard_reset",
+        "_pending_set",
+        "_pending_set_future",
+        "_post_command_polls",
+        "_prime_backoff_initial",
+        "_prime_backoff_max",
+        "_prime_max_tries_streak",
+        "_prime_timeout_s",
+        "_reconnect_delay",
+        "_set_batch_window_s",
+        "rssi",
+    )
+
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
         self.hass = hass
-        self._breaker_until_ts: float = 0.0
+        self._breaker_until_ns: int = 0
         self._breaker_level: int = 0
+        self._fail_count: int = 0
+        self._connected_since: float = 0.0
         self._need_hard_reset: bool = False
         self._initial_settle_s = 2.5
         self._io_lock = asyncio.Lock()
         self._config_entry: ConfigEntry = config_entry
         self._last_btle_device: BLEDevice | None = None
         self._had_successful_update: bool = False
+        self._last_adv_refresh_ts: float = 0.0
 
-        assert self.config[CONF_MAC] is not None
+        cfg = self.config
+        mac = cfg[CONF_MAC]
+        assert mac is not None
         btle_device = bluetooth.async_ble_device_from_address(
             hass,
-            self.config[CONF_MAC],
+            mac,
             connectable=True,
         )
         _LOGGER.warning(
             "TION_DIAG init BLE lookup: mac=%s found=%s device=%s",
-            self.config[CONF_MAC],
+            mac,
             btle_device is not None,
             _describe_btle_device(btle_device),
         )
@@ -164,20 +308,22 @@ class TionInstance(DataUpdateCoordinator):
         else:
             _LOGGER.warning(
                 "TION_DIAG init fallback to MAC: device %s is not in discovery cache yet",
-                self.config[CONF_MAC],
+                mac,
             )
 
         keep_alive_seconds: int = TION_SCHEMA[CONF_KEEP_ALIVE]["default"]
         try:
-            keep_alive_seconds = int(self.config[CONF_KEEP_ALIVE])
+            keep_alive_seconds = int(cfg[CONF_KEEP_ALIVE])
         except KeyError:
             pass
         self._keep_alive_seconds = keep_alive_seconds
         self.__keep_alive = timedelta(seconds=keep_alive_seconds)
 
-        self._reconnect_delay = timedelta(seconds=10)
+        self._reconnect_delay = _RECONNECT_DELAYS[0]
         self._prime_timeout_s = 60.0
-        self._prime_sleep_s = 0.25
+        self._prime_backoff_initial = 0.1
+        self._prime_backoff_max = 2.0
+        self._prime_max_tries_streak = 3
         tion_source = self._last_btle_device or self.unique_id
         self.__tion: Tion = self.getTion(self.model, tion_source)
         _LOGGER.warning(
@@ -186,8 +332,22 @@ class TionInstance(DataUpdateCoordinator):
             type(self.__tion).__name__,
             _describe_btle_device(tion_source),
         )
-        self._is_connected: bool = False
+        self._connected_evt = asyncio.Event()
+        self._link_lost = asyncio.Event()
         self._connect_lock = asyncio.Lock()
+        self._adapter_lock_fd: int | None = None
+        self._inflight_get: asyncio.Future | None = None
+        self._inflight_joined: bool = False
+        self._last_result_ts: float = 0.0
+        self._fast_polls_left: int = 0
+        self._post_command_polls = 3
+        self._change_ewma_s: float | None = None
+        self._change_ewma_alpha = 0.3
+        self._last_change_ts: float = 0.0
+        self._last_state: tuple | None = None
+        self._pending_set: dict = {}
+        self._pending_set_future: asyncio.Future | None = None
+        self._set_batch_window_s = 0.15
         self.rssi: int = 0
 
         if self._config_entry.unique_id is None:
@@ -203,7 +363,7 @@ class TionInstance(DataUpdateCoordinator):
             _LOGGER.critical("Done! Please restart Home Assistant.")
 
         super().__init__(
-            name=self.config.get("name", TION_SCHEMA["name"]["default"]),
+            name=cfg.get("name", TION_SCHEMA["name"]["default"]),
             hass=hass,
             logger=_LOGGER,
             update_interval=self.__keep_alive,
@@ -217,21 +377,38 @@ class TionInstance(DataUpdateCoordinator):
             self.data,
         )
 
+    @property
+    def _is_connected(self) -> bool:
+        return self._connected_evt.is_set()
+
+    @_is_connected.setter
+    def _is_connected(self, value: bool) -> None:
+        if value:
+            self._connected_evt.set()
+        else:
+            self._connected_evt.clear()
+
     @property
     def keep_alive_seconds(self) -> int:
         return self._keep_alive_seconds
 
-    @property
+    @cached_property
     def config(self) -> dict:
-        try:
-            data = dict(self._config_entry.data or {})
-        except AttributeError:
-            data = {}
-        try:
-            data.update(self._config_entry.options or {})
-        except AttributeError:
-            pass
-        return data
+        entry = self._config_entry
+        return {**(getattr(entry, "data", None) or {}), **(getattr(entry, "options", None) or {})}
+
+    async def _handle_options_update(self, _hass: HomeAssistant, _config_entry: ConfigEntry) -> None:
+        """Drop values cached from config entry, so new options are used without restart."""
+        for attr in ("config", "unique_id", "model", "supported_air_sources"):
+            self.__dict__.pop(attr, None)
+
+        keep_alive_seconds = int(self.config.get(CONF_KEEP_ALIVE, TION_SCHEMA[CONF_KEEP_ALIVE]["default"]))
+        if keep_alive_seconds != self._keep_alive_seconds:
+            self._keep_alive_seconds = keep_alive_seconds
+            self.__keep_alive = timedelta(seconds=keep_alive_seconds)
+            if self._is_connected:
+                self.update_interval = self.__keep_alive
+        _LOGGER.warning("TION_DIAG options updated: config=%s", self.config)
 
     @cached_property
     def unique_id(self) -> str:
@@ -255,38 +432,45 @@ class TionInstance(DataUpdateCoordinator):
             return ["outside", "mixed", "recirculation"]
         return ["outside", "recirculation"]
 
+    @property
+    def fresh_ttl(self) -> int:
+        """Seconds after successful read or command while data is fresh enough to skip polling."""
+        try:
+            return int(self.config[CONF_FRESH_TTL])
+        except (KeyError, TypeError, ValueError):
+            return max(5, self.keep_alive_seconds // 4)
+
+    @property
+    def _gatt_timeout_s(self) -> float:
+        """Limit for one get/set. tion_btle retries inside for much longer on a dead link.
+
+        Floor is above the library's own worst case for a healthy but slow breezer (10 x 1s read wait plus write retries).
+        """
+        return max(15.0, self._keep_alive_seconds / 2)
+
     @property
     def away_temp(self) -> int:
         return self.config.get(CONF_AWAY_TEMP, TION_SCHEMA[CONF_AWAY_TEMP]["default"])
 
     def _mark_disconnected(self, reason: str) -> None:
-        fail_count = getattr(self, "_fail_count", 0) + 1
-        setattr(self, "_fail_count", fail_count)
-        backoff_s = min(10 * (2 ** (fail_count - 1)), 60)
-
-        reason_l = (reason or "").lower()
-        is_handshake = (
-            "handshake timeout" in reason_l
-            or "services are not ready" in reason_l
-            or "service discovery has not been performed" in reason_l
-            or "maxtriesexceeded" in reason_l
-            or "timeout" in reason_l
-        )
-        if is_handshake:
+        self._fail_count += 1
+        fail_count = self._fail_count
+        # +-25% jitter: breezers dropped by one adapter glitch should not retry in lockstep
+        self._reconnect_delay = _RECONNECT_DELAYS[min(fail_count, len(_RECONNECT_DELAYS)) - 1] * random.uniform(0.75, 1.25)
+
+        if _HANDSHAKE_FAILURE_RE.search(reason or ""):
             self._breaker_level = min(self._breaker_level + 1, 3)
-            silence = [15, 45, 120, 300][self._breaker_level]
-            silence = int(silence * random.uniform(0.8, 1.2))
-            self._breaker_until_ts = time.monotonic() + silence
+            # +-20% jitter
+            silence_ns = _BREAKER_NS[self._breaker_level] * random.randint(80, 120) // 100
+            self._breaker_until_ns = time.monotonic_ns() + silence_ns
             self._need_hard_reset = True
 
-        self._reconnect_delay = timedelta(seconds=backoff_s)
-        breaker_s = max(0, int(self._breaker_until_ts - time.monotonic()))
         _LOGGER.warning(
             "TION_DIAG mark_disconnected: reason=%s fail_count=%s backoff=%ss breaker=%ss need_hard_reset=%s was_connected=%s",
             reason,
             fail_count,
-            backoff_s,
-            breaker_s,
+            self._reconnect_delay.seconds,
+            self._breaker_left_s(),
             self._need_hard_reset,
             self._is_connected,
         )
@@ -294,12 +478,60 @@ class TionInstance(DataUpdateCoordinator):
         self._is_connected = False
         self.update_interval = self._reconnect_delay
 
+    def _reset_backoff_if_sustained(self) -> None:
+        """Forget reconnect backoff once link has survived a keep-alive period.
+
+        Breezer that connects and drops at once keeps climbing the backoff instead of retrying at the shortest step.
+        """
+        if self._fail_count and time.monotonic() - self._connected_since >= self._keep_alive_seconds:
+            self._fail_count = 0
+
+    def _breaker_left_s(self) -> int:
+        """Whole seconds left until breaker allows reconnect, 0 if it is closed."""
+        left_ns = self._breaker_until_ns - time.monotonic_ns()
+        return -(-left_ns // _NS_IN_S) if left_ns > 0 else 0
+
     def _bleak_service_not_ready(self, err: Exception) -> bool:
-        msg = (str(err) or "").lower()
-        return (
-            "service discovery has not been performed yet" in msg
-            or "services are not ready" in msg
-        )
+        return _SERVICES_NOT_READY_RE.search(str(err)) is not None
+
+    def _lib_client(self):
+        """BleakClient used by tion_btle or None if library does not expose it."""
+        return getattr(self.__tion, "_btle", None) or getattr(self.__tion, "_client", None)
+
+    def _hook_lib_disconnect(self) -> None:
+        client = self._lib_client()
+        if client is None or not hasattr(client, "set_disconnected_callback"):
+            _LOGGER.warning("TION_DIAG library BleakClient does not support disconnected callback")
+            return
+        client.set_disconnected_callback(self._on_lib_disconnected)
+
+    @callback
+    def _on_lib_disconnected(self, _client) -> None:
+        self._link_lost.set()
+        if not self._is_connected:
+            return
+        _LOGGER.warning("TION_DIAG bleak disconnected callback: unique_id=%s", self.unique_id)
+        # tion_btle still counts our connect() as active and would skip next one: drop library state before reconnect
+        self._need_hard_reset = True
+        self._mark_disconnected("bleak disconnected callback")
+
+    def _lib_services_resolved(self) -> bool | None:
+        """Check the Bleak client of the library without a GATT round-trip.
+
+        :return: None if the client is not reachable or not connected, otherwise whether service discovery is done
+        """
+        client = self._lib_client()
+        if client is None:
+            return None
+        try:
+            if not client.is_connected:
+                return None
+            services = client.services
+        except bleak.BleakError:
+            return False
+        except AttributeError:
+            return None
+        return bool(getattr(services, "services", services))
 
     async def _temporary_disconnect_for_peer_startup(self, peer_unique_id: str) -> None:
         _LOGGER.warning(
@@ -318,8 +550,11 @@ class TionInstance(DataUpdateCoordinator):
         self.hass.async_create_task(self._delayed_refresh_after_peer_startup(peer_unique_id, 15))
 
     async def _delayed_refresh_after_peer_startup(self, peer_unique_id: str, delay_s: float) -> None:
-        await asyncio.sleep(delay_s)
-        if self._is_connected:
+        try:
+            await asyncio.wait_for(self._connected_evt.wait(), timeout=delay_s)
+        except asyncio.TimeoutError:
+            pass
+        else:
             return
         _LOGGER.warning(
             "TION_DIAG scheduled peer recovery refresh: self=%s peer=%s",
@@ -345,31 +580,23 @@ class TionInstance(DataUpdateCoordinator):
             released,
         )
 
-    async def _hard_reset_connection(self, reason: str, pause_s: float = 0.3) -> None:
-        _LOGGER.warning("TION_DIAG hard_reset_connection start: reason=%s", reason)
-        self._is_connected = False
-        try:
-            await self.__tion.disconnect()
-            _LOGGER.warning("TION_DIAG hard_reset_connection disconnect done")
-        except Exception as e:
-            _LOGGER.warning("TION_DIAG hard_reset_connection disconnect failed: %s", e)
-        await asyncio.sleep(pause_s)
-        async with GLOBAL_BLE_CONNECT_SEM:
-            _LOGGER.warning("TION_DIAG hard_reset_connection connect start")
-            await self.__tion.connect()
-            await asyncio.sleep(self._initial_settle_s)
-        _LOGGER.warning("TION_DIAG hard_reset_connection done")
-
     async def _hard_reset_ble(self, reason: str) -> None:
+        """Drop BLE link of breezer and create new Tion object, so no library state survives."""
         _LOGGER.warning("TION_DIAG hard_reset_ble start: reason=%s", reason)
         try:
             await self.__tion.disconnect()
             _LOGGER.warning("TION_DIAG hard_reset_ble disconnect done")
         except Exception as e:
             _LOGGER.warning("TION_DIAG hard_reset_ble disconnect failed: %s", e)
+        try:
+            # BlueZ may still hold a link that the dropped client does not know about; new connect would fail on it
+            await close_stale_connections_by_address(self.unique_id)
+        except Exception as e:
+            _LOGGER.warning("TION_DIAG hard_reset_ble closing stale connections failed: %s", e)
+        self._is_connected = False
+
         source = self._last_btle_device or self.unique_id
         self.__tion = self.getTion(self.model, source)
-        self._is_connected = False
         _LOGGER.warning(
             "TION_DIAG hard_reset_ble recreated Tion object: model=%s tion_class=%s source=%s",
             self.model,
@@ -388,86 +615,210 @@ class TionInstance(DataUpdateCoordinator):
         _LOGGER.warning("TION_DIAG shutdown start: unique_id=%s", self.unique_id)
         self._is_connected = False
         self._need_hard_reset = False
-        self._breaker_until_ts = 0.0
+        self._breaker_until_ns = 0
         self._breaker_level = 0
         try:
             await self.__tion.disconnect()
             _LOGGER.warning("TION_DIAG shutdown disconnect done")
         except Exception as e:
             _LOGGER.warning("TION_DIAG shutdown disconnect failed: %s", e)
+        self._close_adapter_lock()
 
-    async def _prime_services(self) -> None:
+    @property
+    def _adapter(self) -> str:
+        """Name of bluetooth adapter that sees breezer.
+
+        BlueZ object path looks like /org/bluez/hci0/dev_XX; remote scanners (proxies) put their id to source.
+        """
+        details = getattr(self._last_btle_device, "details", None)
+        if not isinstance(details, dict):
+            return "hci0"
+        parts = details.get("path", "").split("/")
+        if len(parts) > 3 and parts[3].startswith("hci"):
+            return parts[3]
+        return details.get("source") or "hci0"
+
+    async def _acquire_adapter_lock(self, timeout: float = 15.0) -> bool:
+        """Take inter-process lock of bluetooth adapter to avoid concurrent connects (org.bluez.Error.InProgress).
+
+        :return: True if lock was taken. On any problem we just go on without lock.
+        """
+        if not self.config.get(CONF_SERIALIZE_ADAPTER, TION_SCHEMA[CONF_SERIALIZE_ADAPTER]["default"]):
+            return False
+
+        if self._adapter_lock_fd is None:
+            path = _adapter_lock_path(self._adapter)
+            try:
+                self._adapter_lock_fd = await self.hass.async_add_executor_job(
+                    os.open, path, os.O_RDWR | os.O_CREAT, 0o644
+                )
+            except OSError as e:
+                _LOGGER.warning("TION_DIAG adapter lock: could not open %s: %s", path, e)
+                return False
+
+        started = time.monotonic()
+        # short first polls: the other holder usually finishes its handshake soon
+        delay = 0.02
+        while True:
+            try:
+                fcntl.flock(self._adapter_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                _LOGGER.warning("TION_DIAG adapter lock acquired: waited=%.2fs", time.monotonic() - started)
+                return True
+            except BlockingIOError:
+                if time.monotonic() - started >= timeout:
+                    _LOGGER.warning("TION_DIAG adapter lock busy for %ss, connecting without lock", timeout)
+                    return False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.25)
+            except OSError as e:
+                _LOGGER.warning("TION_DIAG adapter lock failed, connecting without lock: %s", e)
+                return False
+
+    def _release_adapter_lock(self) -> None:
+        if self._adapter_lock_fd is None:
+            return
+        try:
+            fcntl.flock(self._adapter_lock_fd, fcntl.LOCK_UN)
+        except OSError as e:
+            _LOGGER.warning("TION_DIAG adapter lock release failed: %s", e)
+
+    def _close_adapter_lock(self) -> None:
+        if self._adapter_lock_fd is None:
+            return
+        with contextlib.suppress(OSError):
+            os.close(self._adapter_lock_fd)
+        self._adapter_lock_fd = None
+
+    async def _prime_services(self, start_ts: float | None = None) -> None:
+        """Wait until breezer answers to get().
+
+        :param start_ts: monotonic time when connect was started. Handshake timeout is counted from it.
+        """
         _LOGGER.warning(
-            "TION_DIAG prime start: timeout=%ss sleep=%ss",
+            "TION_DIAG prime start: timeout=%ss backoff=%s..%ss",
             self._prime_timeout_s,
-            self._prime_sleep_s,
+            self._prime_backoff_initial,
+            self._prime_backoff_max,
         )
-        started = time.monotonic()
+        # loop-invariant lookups are bound once: on weak signal this loop may spin for a minute
+        _time = time.monotonic
+        _sleep = asyncio.sleep
+        _wait_for = asyncio.wait_for
+        gatt_timeout_s = self._gatt_timeout_s
+        _random = random.random
+        _get = self.__tion.get
+        _services_resolved = self._lib_services_resolved
+        io_lock = self._io_lock
+        link_lost = self._link_lost
+        backoff_max = self._prime_backoff_max
+
+        started = _time() if start_ts is None else start_ts
+        deadline = started + self._prime_timeout_s
         last_err: Exception | None = None
-        await asyncio.sleep(0.15)
-        sleep_s = max(0.25, getattr(self, "_prime_sleep_s", 0.25))
+        delay = self._prime_backoff_initial
         not_ready_streak = 0
+        max_tries_streak = 0
         attempt = 0
 
-        while time.monotonic() - started < self._prime_timeout_s:
+        while _time() < deadline:
+            if link_lost.is_set():
+                raise UpdateFailed("Handshake failed: device disconnected") from last_err
+
+            if _services_resolved() is False:
+                # GATT discovery is still running: get() would only fail with "not ready", so don't send it.
+                # Skip counts as "not ready" answer, so stuck discovery still fails fast and gets hard reset.
+                not_ready_streak += 1
+                if not_ready_streak >= 7:
+                    _LOGGER.warning(
+                        "TION_DIAG prime services unresolved: streak=%s elapsed=%.2fs",
+                        not_ready_streak,
+                        _time() - started,
+                    )
+                    raise UpdateFailed("Handshake timeout: BLE services are not ready (fast)") from last_err
+                await _sleep(delay * (0.5 + _random() * 0.5))
+                delay = min(backoff_max, delay * 2)
+                continue
+
             attempt += 1
             try:
                 _LOGGER.warning("TION_DIAG prime attempt %s get start", attempt)
-                async with self._io_lock:
-                    await self.__tion.get()
-                _LOGGER.warning("TION_DIAG prime success: attempt=%s elapsed=%.2fs", attempt, time.monotonic() - started)
+                async with io_lock:
+                    await _wait_for(_get(), timeout=gatt_timeout_s)
+                _LOGGER.warning("TION_DIAG prime success: attempt=%s elapsed=%.2fs", attempt, _time() - started)
                 return
             except MaxTriesExceededError as e:
                 last_err = e
-                _LOGGER.warning("TION_DIAG prime MaxTriesExceeded: attempt=%s err=%s", attempt, e)
-                await asyncio.sleep(sleep_s)
-                sleep_s = min(sleep_s * 1.5, 2.0)
-                continue
+                max_tries_streak += 1
+                _LOGGER.warning("TION_DIAG prime MaxTriesExceeded: attempt=%s streak=%s err=%r", attempt, max_tries_streak, e)
+                if max_tries_streak >= self._prime_max_tries_streak:
+                    # every MaxTriesExceeded is already a series of retries inside tion_btle: protocol is out of sync
+                    raise UpdateFailed(f"Handshake failed: MaxTriesExceeded {max_tries_streak} times in a row") from e
             except TimeoutError as e:
                 _LOGGER.warning("TION_DIAG prime TimeoutError: attempt=%s err=%s", attempt, e)
                 raise UpdateFailed("Handshake failed: BLE operation timed out") from e
             except bleak.BleakError as e:
                 last_err = e
                 _LOGGER.warning("TION_DIAG prime BleakError: attempt=%s err=%s", attempt, e)
-                if self._bleak_service_not_ready(e):
-                    not_ready_streak += 1
-                    elapsed = time.monotonic() - started
-                    if not_ready_streak >= 7 and elapsed < 10.0:
-                        raise UpdateFailed(
-                            "Handshake timeout: BLE services are not ready (fast)"
-                        ) from e
-                    await asyncio.sleep(sleep_s)
-                    sleep_s = min(sleep_s * 1.5, 2.0)
-                    continue
-                raise UpdateFailed(f"Handshake failed: {e}") from e
+                if not self._bleak_service_not_ready(e):
+                    raise UpdateFailed(f"Handshake failed: {e}") from e
+                not_ready_streak += 1
+                elapsed = _time() - started
+                if not_ready_streak >= 7 and elapsed < 10.0:
+                    raise UpdateFailed(
+                        "Handshake timeout: BLE services are not ready (fast)"
+                    ) from e
             except Exception as e:
                 _LOGGER.exception("TION_DIAG prime unexpected error: attempt=%s", attempt)
                 raise UpdateFailed(f"Handshake failed with unexpected error: {e}") from e
 
+            await _sleep(delay * (0.5 + _random() * 0.5))
+            delay = min(backoff_max, delay * 2)
+
         _LOGGER.warning(
             "TION_DIAG prime timeout: attempts=%s elapsed=%.2fs last_err=%s",
             attempt,
-            time.monotonic() - started,
+            _time() - started,
             last_err,
         )
         raise UpdateFailed("Handshake timeout: BLE services are not ready") from last_err
 
+    async def _connect_and_prime(self, started: float) -> None:
+        """Connect, let breezer settle and prime services. Any link loss on the way fails the handshake at once."""
+        self._link_lost.clear()
+        _LOGGER.warning("TION_DIAG connect calling tion.connect")
+        await self.__tion.connect()
+        self._hook_lib_disconnect()
+        _LOGGER.warning("TION_DIAG connect tion.connect returned: elapsed=%.2fs", time.monotonic() - started)
+
+        _LOGGER.warning("TION_DIAG connect settle wait: %ss", self._initial_settle_s)
+        try:
+            await asyncio.wait_for(self._link_lost.wait(), timeout=self._initial_settle_s)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise UpdateFailed("Handshake failed: device disconnected while settling")
+
+        await self._prime_services(started)
+
     async def _ensure_connected(self) -> None:
+        if self._is_connected:
+            # steady state: no lock, no diagnostics
+            return
+
         async with self._connect_lock:
             _LOGGER.warning(
                 "TION_DIAG ensure_connected enter: is_connected=%s breaker_left=%ss need_hard_reset=%s fail_count=%s",
                 self._is_connected,
-                max(0, int(self._breaker_until_ts - time.monotonic())),
+                self._breaker_left_s(),
                 self._need_hard_reset,
-                getattr(self, "_fail_count", 0),
+                self._fail_count,
             )
             if self._is_connected:
                 _LOGGER.warning("TION_DIAG ensure_connected already connected")
                 return
 
-            now = time.monotonic()
-            if now < self._breaker_until_ts:
-                remaining = int(self._breaker_until_ts - now)
+            remaining = self._breaker_left_s()
+            if remaining:
                 _LOGGER.warning("TION_DIAG ensure_connected breaker open: remaining=%ss", remaining)
                 raise UpdateFailed(f"Breaker open: waiting {remaining}s before reconnect")
 
@@ -479,14 +830,15 @@ class TionInstance(DataUpdateCoordinator):
                     await self._hard_reset_ble("requested by breaker")
                     self._need_hard_reset = False
 
-                async with GLOBAL_BLE_CONNECT_SEM:
-                    _LOGGER.warning("TION_DIAG connect lock acquired: unique_id=%s", self.unique_id)
-                    _LOGGER.warning("TION_DIAG connect calling tion.connect")
-                    await self.__tion.connect()
-                    _LOGGER.warning("TION_DIAG connect tion.connect returned: elapsed=%.2fs", time.monotonic() - started)
-                    _LOGGER.warning("TION_DIAG connect settle sleep: %ss", self._initial_settle_s)
-                    await asyncio.sleep(self._initial_settle_s)
-                    await self._prime_services()
+                adapter = self._adapter
+                async with _adapter_connect_lock(adapter):
+                    _LOGGER.warning("TION_DIAG connect lock acquired: unique_id=%s adapter=%s", self.unique_id, adapter)
+                    adapter_locked = await self._acquire_adapter_lock()
+                    try:
+                        await self._connect_and_prime(started)
+                    finally:
+                        if adapter_locked:
+                            self._release_adapter_lock()
 
             except TimeoutError as e:
                 _LOGGER.warning("TION_DIAG connect TimeoutError after %.2fs: %s", time.monotonic() - started, e)
@@ -508,15 +860,15 @@ class TionInstance(DataUpdateCoordinator):
                     _LOGGER.warning("TION_DIAG connect failure cleanup disconnect failed: %s", disconnect_err)
 
                 self._is_connected = False
-                if isinstance(e, UpdateFailed) and "services are not ready" in str(e).lower():
+                if isinstance(e, UpdateFailed) and self._bleak_service_not_ready(e):
                     self._need_hard_reset = True
 
                 self._mark_disconnected(f"connect/prime failed: {e}")
                 raise
             else:
                 self._is_connected = True
-                setattr(self, "_fail_count", 0)
-                self._breaker_until_ts = 0.0
+                self._connected_since = time.monotonic()
+                self._breaker_until_ns = 0
                 self._breaker_level = 0
                 self.update_interval = self.__keep_alive
                 _LOGGER.warning("TION_DIAG connected successfully: elapsed=%.2fs", time.monotonic() - started)
@@ -529,11 +881,97 @@ class TionInstance(DataUpdateCoordinator):
         _LOGGER.warning("TION_DIAG disconnect ignored in persistent mode")
         return True
 
-    @staticmethod
-    def _decode_state(state: str) -> bool:
-        return state == "on"
+    async def _coalesced_get(self) -> dict:
+        """Read state from breezer. Concurrent callers share one in-flight GATT read.
+
+        Response is normalized in place, so the caller that did the read gets it as is,
+        and callers that joined get their own copies of an untouched snapshot.
+        """
+        if self._inflight_get is not None:
+            _LOGGER.warning("TION_DIAG get joined in-flight read")
+            self._inflight_joined = True
+            return dict(await asyncio.shield(self._inflight_get))
+
+        future = self.hass.loop.create_future()
+        # nobody may join the read, so mark exception as retrieved to keep asyncio quiet
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight_get = future
+        self._inflight_joined = False
+        try:
+            async with self._io_lock:
+                response = await asyncio.wait_for(self.__tion.get(), timeout=self._gatt_timeout_s)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            # joiners resume after owner has normalized response: give them a snapshot, copy only if somebody joined
+            future.set_result(dict(response) if self._inflight_joined else response)
+            return response
+        finally:
+            self._inflight_get = None
+
+    def _track_state_change(self, data: dict) -> None:
+        """Update moving average of time between observed state changes."""
+        state = tuple(data.get(k) for k in _STATE_KEYS)
+        if state == self._last_state:
+            return
+        now = time.monotonic()
+        if self._last_state is not None:
+            seen = now - self._last_change_ts
+            if self._change_ewma_s is None:
+                self._change_ewma_s = seen
+            else:
+                self._change_ewma_s += self._change_ewma_alpha * (seen - self._change_ewma_s)
+        self._last_state = state
+        self._last_change_ts = now
+
+    def _next_poll_interval(self) -> timedelta:
+        """Poll soon after a command (change is likely), otherwise follow observed rate of state changes.
+
+        Result is kept between keep_alive/4 and keep_alive: configured interval is never stretched,
+        so sensors are refreshed at least as often as user asked.
+        """
+        keep_alive = self._keep_alive_seconds
+        if self._fast_polls_left > 0:
+            self._fast_polls_left -= 1
+            return self._fast_poll_interval()
+        if self._change_ewma_s is None:
+            return self.__keep_alive
+        # quiet period since last change counts too: average alone is frozen while nothing changes
+        expected = max(self._change_ewma_s, time.monotonic() - self._last_change_ts)
+        seconds = min(max(expected / 2, keep_alive / 4), keep_alive)
+        return timedelta(seconds=seconds)
+
+    def _fast_poll_interval(self) -> timedelta:
+        """Interval of polls following a command."""
+        keep_alive = self._keep_alive_seconds
+        # HA fires refresh up to 0.5s early (whole-second rounding), so poll inside fresh_ttl would be skipped
+        return timedelta(seconds=min(max(self.fresh_ttl + 1, keep_alive / 4), keep_alive))
+
+    def _normalize_result(self, raw: dict) -> dict:
+        """Convert tion_btle response to coordinator data.
+
+        Response is a fresh dict owned by us, so it is updated in place instead of being copied.
+        """
+        for src, dst, convert in _NORMALIZERS:
+            raw[dst] = convert(raw[src])
+        raw["rssi"] = self.rssi
+        return raw
+
+    async def async_update_state(self, force: bool = False):
+        # never serve cache for a link known to be down: refresh must reconnect and report failure
+        if (
+            not force
+            and self._is_connected
+            and self._had_successful_update
+            and time.monotonic() - self._last_result_ts < self.fresh_ttl
+        ):
+            _LOGGER.warning("TION_DIAG update_state skipped: data is fresh")
+            return self.data
 
-    async def async_update_state(self):
         if not self._had_successful_update:
             _LOGGER.warning("TION_DIAG startup update waiting for global startup lock: unique_id=%s", self.unique_id)
             async with GLOBAL_BLE_STARTUP_LOCK:
@@ -543,21 +981,22 @@ class TionInstance(DataUpdateCoordinator):
         return await self._async_update_state_inner()
 
     async def _async_update_state_inner(self):
-        _LOGGER.warning(
-            "TION_DIAG update_state start: is_connected=%s data_keys=%s",
-            self._is_connected,
-            sorted((self.data or {}).keys()),
-        )
-        response: dict[str, str | bool | int] = {}
+        if _LOGGER.isEnabledFor(logging.WARNING):
+            _LOGGER.warning(
+                "TION_DIAG update_state start: is_connected=%s data_keys=%s",
+                self._is_connected,
+                sorted((self.data or {}).keys()),
+            )
+        response: dict[str, str | bool | int]
 
         try:
             await self._ensure_connected()
             _LOGGER.warning("TION_DIAG update_state get start")
-            async with self._io_lock:
-                response = await self.__tion.get()
-            _LOGGER.warning("TION_DIAG update_state get success: keys=%s raw=%s", sorted(response.keys()), response)
-            setattr(self, "_fail_count", 0)
-            self.update_interval = self.__keep_alive
+            response = await self._coalesced_get()
+            self._last_result_ts = time.monotonic()
+            if _LOGGER.isEnabledFor(logging.WARNING):
+                _LOGGER.warning("TION_DIAG update_state get success: keys=%s raw=%s", sorted(response.keys()), response)
+            self._reset_backoff_if_sustained()
 
         except MaxTriesExceededError as e:
             _LOGGER.warning("TION_DIAG update_state MaxTriesExceeded: %s", e)
@@ -579,10 +1018,11 @@ class TionInstance(DataUpdateCoordinator):
 
         except UpdateFailed as e:
             _LOGGER.warning("TION_DIAG update_state UpdateFailed: %s", e)
-            if "services are not ready" in str(e).lower() or "timeout" in str(e).lower():
+            msg = str(e)
+            if _UPDATE_NEEDS_HARD_RESET_RE.search(msg):
                 self._need_hard_reset = True
-            if "connect timed out" not in str(e).lower() and "breaker open" not in str(e).lower():
-                self._mark_disconnected(str(e))
+            if not _UPDATE_ALREADY_MARKED_RE.search(msg):
+                self._mark_disconnected(msg)
             raise
 
         except Exception as e:
@@ -590,21 +1030,51 @@ class TionInstance(DataUpdateCoordinator):
             self._mark_disconnected(f"{type(e).__name__}: {e}")
             raise
 
-        response["is_on"] = self._decode_state(response["state"])
-        response["heater"] = self._decode_state(response["heater"])
-        response["is_heating"] = self._decode_state(response["heating"])
-        response["filter_remain"] = math.ceil(response["filter_remain"])
-        response["fan_speed"] = int(response["fan_speed"])
-        response["rssi"] = self.rssi
+        response = self._normalize_result(response)
+        self._track_state_change(response)
+        self.update_interval = self._next_poll_interval()
 
         self._had_successful_update = True
         _LOGGER.warning("TION_DIAG update_state normalized success: %s", response)
         return response
 
-    async def set(self, **kwargs):
+    async def set(self, force: bool = False, **kwargs):
         if "fan_speed" in kwargs:
             kwargs["fan_speed"] = int(kwargs["fan_speed"])
 
+        if not force and self._is_noop_set(kwargs):
+            _LOGGER.warning("TION_DIAG set skipped: breezer is already in requested state %s", kwargs)
+            return
+
+        self._pending_set.update(kwargs)
+        if self._pending_set_future is None:
+            future = self.hass.loop.create_future()
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending_set_future = future
+            self.hass.async_create_task(self._flush_sets())
+        await asyncio.shield(self._pending_set_future)
+
+    async def _flush_sets(self) -> None:
+        """Send all commands requested during batch window as one write."""
+        future = self._pending_set_future
+        try:
+            try:
+                await asyncio.sleep(self._set_batch_window_s)
+            finally:
+                # close the batch even if cancelled: next set() must start a new one, not wait for this
+                kwargs, self._pending_set = self._pending_set, {}
+                self._pending_set_future = None
+            await self._set_now(**kwargs)
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException:
+            # cancelled on unload: callers of set() must not wait forever
+            future.cancel()
+            raise
+        else:
+            future.set_result(None)
+
+    async def _set_now(self, **kwargs):
         original_args = kwargs.copy()
         if "is_on" in kwargs:
             kwargs["state"] = "on" if kwargs["is_on"] else "off"
@@ -619,7 +1089,7 @@ class TionInstance(DataUpdateCoordinator):
             try:
                 _LOGGER.warning("TION_DIAG set calling tion.set: %s", kwargs)
                 async with self._io_lock:
-                    await self.__tion.set(kwargs)
+                    await asyncio.wait_for(self.__tion.set(kwargs), timeout=self._gatt_timeout_s)
                 _LOGGER.warning("TION_DIAG set tion.set success")
             except MaxTriesExceededError as e:
                 _LOGGER.warning("TION_DIAG set MaxTriesExceeded: %s", e)
@@ -646,29 +1116,35 @@ class TionInstance(DataUpdateCoordinator):
         except Exception as e:
             _LOGGER.exception("TION_DIAG set unexpected error")
             self._mark_disconnected(f"{type(e).__name__} on set: {e}")
-            if "service" in str(e).lower() or "timeout" in str(e).lower():
+            if _SET_NEEDS_HARD_RESET_RE.search(str(e)):
                 self._need_hard_reset = True
             raise HomeAssistantError(f"Tion command failed: {type(e).__name__}: {e}") from e
 
         else:
+            self._last_result_ts = time.monotonic()
             self.data.update(original_args)
             self.async_update_listeners()
-            setattr(self, "_fail_count", 0)
-            self.update_interval = self.__keep_alive
+            self._reset_backoff_if_sustained()
+            self._fast_polls_left = self._post_command_polls
+            self.update_interval = self._fast_poll_interval()
+            # new interval is used only for polls scheduled after it: move already scheduled keep-alive poll
+            self._schedule_refresh()
             _LOGGER.warning("TION_DIAG set success: data now=%s", self.data)
 
+    def _is_noop_set(self, kwargs: dict) -> bool:
+        """Check if every requested value equals fresh data, so there is nothing to write.
+
+        Commands waiting in current batch count as data: they will be written anyway.
+        """
+        data = {**(self.data or {}), **self._pending_set}
+        if not self._had_successful_update or time.monotonic() - self._last_result_ts >= self.fresh_ttl:
+            return False
+        return all(k in data and data[k] == v for k, v in kwargs.items())
+
     @staticmethod
     def getTion(model: str, mac: str | BLEDevice) -> tion_btle.TionS3 | tion_btle.TionLite | tion_btle.TionS4:
         _LOGGER.warning("TION_DIAG getTion: model=%s source=%s", model, _describe_btle_device(mac))
-        if model == "S3":
-            from tion_btle.s3 import TionS3 as Breezer
-        elif model == "S4":
-            from tion_btle.s4 import TionS4 as Breezer
-        elif model == "Lite":
-            from tion_btle.lite import TionLite as Breezer
-        else:
-            raise NotImplementedError("Model '%s' is not supported!" % model)
-        return Breezer(mac)
+        return breezer_class(model)(mac)
 
     @property
     def device_info(self):
@@ -702,3 +1178,21 @@ class TionInstance(DataUpdateCoordinator):
             self.rssi = service_info.rssi
             self.__tion.update_btle_device(service_info.device)
             _LOGGER.warning("TION_DIAG bluetooth callback updated Tion BLEDevice and RSSI=%s", self.rssi)
+
+        self._refresh_on_advertisement(service_info.time)
+
+    @callback
+    def _refresh_on_advertisement(self, adv_ts: float) -> None:
+        """Reconnect as soon as a lost breezer advertises again instead of waiting for the next poll.
+
+        Breezer does not advertise while connected, so an advertisement means that device is connectable again.
+        """
+        if self._is_connected or not self._had_successful_update or self._connect_lock.locked():
+            return
+        if time.monotonic_ns() < self._breaker_until_ns:
+            return
+        if adv_ts - self._last_adv_refresh_ts < self._reconnect_delay.total_seconds():
+            return
+        self._last_adv_refresh_ts = adv_ts
+        _LOGGER.warning("TION_DIAG advertisement while disconnected: requesting refresh")
+        self.hass.async_create_task(self.async_request_refresh())
@@ -32,19 +32,19 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     }
 )
 
-devices = []
+devices: set[str] = set()
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     """Setup entry"""
-    tion_instance: TionInstance = hass.data[DOMAIN][config_entry.unique_id]
+    tion_instance: TionInstance = hass.data[DOMAIN][config_entry.entry_id]
     unique_id = tion_instance.unique_id
 
     if unique_id not in devices:
-        devices.append(unique_id)
+        devices.add(unique_id)
         async_add_entities([TionClimateEntity(hass, tion_instance)])
     else:
-        _LOGGER.warning(f"Device {unique_id} is already configured! ")
+        _LOGGER.warning("Device %s is already configured! ", unique_id)
 
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service(
@@ -64,7 +64,7 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
     _attr_hvac_modes = [HVACMode.HEAT, HVACMode.FAN_ONLY, HVACMode.OFF]
     _attr_min_temp = 0
     _attr_max_temp = 30
-    _attr_fan_modes = [1, 2, 3, 4, 5, 6]
+    _attr_fan_modes = ["1", "2", "3", "4", "5", "6"]
     _attr_precision = PRECISION_WHOLE
     _attr_target_temperature_step = 1
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -72,7 +72,11 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
     _attr_preset_mode = PRESET_NONE
     _attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.FAN_MODE | ClimateEntityFeature.PRESET_MODE | ClimateEntityFeature.TURN_ON | ClimateEntityFeature.TURN_OFF
     _attr_icon = 'mdi:air-purifier'
-    _attr_fan_mode: int
+    # fan speed for boost mode: maximum of supported fan_modes
+    boost_fan_mode: int = max(int(x) for x in _attr_fan_modes)
+    # maximum fan speed for sleep mode
+    sleep_max_fan_mode: int = 2
+    _attr_fan_mode: str | None
     coordinator: TionInstance
 
     def __init__(self, hass: HomeAssistant, instance: TionInstance):
@@ -89,9 +93,11 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
         self._saved_fan_mode = None
 
         # current state
-        self._target_temp = None
         self._is_boost: bool = False
-        self._fan_speed = 1
+        self._in_temp = None
+        self._last_written_state: tuple | None = None
+        self._preset_changing: bool = False
+        self._attr_extra_state_attributes = None
 
         if self._away_temp:
             self._attr_preset_modes.append(PRESET_AWAY)
@@ -103,12 +109,19 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
         self._get_current_state()
         ClimateEntity.__init__(self)
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Forget device, so entity is created again after config entry reload."""
+        devices.discard(self.unique_id)
+        await super().async_will_remove_from_hass()
+
     async def async_set_hvac_mode(self, hvac_mode: HVACMode):
         """Set hvac mode."""
         _LOGGER.info("Need to set mode to %s, current mode is %s", hvac_mode, self.hvac_mode)
         if self.hvac_mode == hvac_mode:
-            _LOGGER.debug(f"{self.name} is asked for mode {hvac_mode}, but it is already in {self.hvac_mode}. Do nothing.")
-            pass
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                # entity name is resolved through translations on every access
+                _LOGGER.debug("%s is asked for mode %s, but it is already in %s. Do nothing.",
+                              self.name, hvac_mode, self.hvac_mode)
 
         elif hvac_mode == HVACMode.OFF:
             # Keep last mode while turning off. May be used while calling climate turn_on service
@@ -133,73 +146,61 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
 
     async def async_set_preset_mode(self, preset_mode: str):
         """Set new preset mode."""
-        actions = []
-        _LOGGER.debug("Going to change preset mode from %s to %s", self.preset_mode, preset_mode)
-        if preset_mode == PRESET_AWAY and self.preset_mode != PRESET_AWAY:
-            _LOGGER.info("Going to AWAY mode. Will save target temperature %s", self.target_temperature)
-            self._saved_target_temp = self.target_temperature
-            actions.append([self._async_set_state, {'heater_temp': self._away_temp}])
-
-        if preset_mode != PRESET_AWAY and self.preset_mode == PRESET_AWAY and self._saved_target_temp:
-            # retuning from away mode
-            _LOGGER.info("Returning from AWAY mode: will set saved temperature %s", self._saved_target_temp)
-            actions.append([self._async_set_state, {'heater_temp': self._saved_target_temp}])
-            self._saved_target_temp = None
-
-        if preset_mode == PRESET_SLEEP and self.preset_mode != PRESET_SLEEP:
-            _LOGGER.info("Going to night mode: will save fan_speed: %s", self.fan_mode)
-            if self._saved_fan_mode is None and self.fan_mode is not None:
-                self._saved_fan_mode = int(self.fan_mode)
-            actions.append([self.async_set_fan_mode, {'fan_mode': min(int(self.fan_mode or 1), self.sleep_max_fan_mode)}])
-
-        if preset_mode == PRESET_BOOST and not self._is_boost:
-            self._is_boost = True
-            if self._saved_fan_mode is None and self.fan_mode is not None:
-                self._saved_fan_mode = int(self.fan_mode)
-            actions.append([self.async_set_fan_mode, {'fan_mode': self.boost_fan_mode}])
-
-        if self.preset_mode in [PRESET_BOOST, PRESET_SLEEP] and preset_mode not in [PRESET_BOOST, PRESET_SLEEP]:
-            # returning from boost or sleep mode
-            _LOGGER.info("Returning from %s mode. Going to set fan speed %d", self.preset_mode, self._saved_fan_mode)
-            if self.preset_mode == PRESET_BOOST:
-                self._is_boost = False
-
-            if self._saved_fan_mode is not None:
-                actions.append([self.async_set_fan_mode, {'fan_mode': self._saved_fan_mode}])
-                self._saved_fan_mode = None
-
-        self._attr_preset_mode = preset_mode
-
-        for a in actions:
-            await a[0](**a[1])
+        current = self.preset_mode
+        _LOGGER.debug("Going to change preset mode from %s to %s", current, preset_mode)
+        # new preset must be visible to async_set_fan_mode (boost and sleep speed limits)
         self._attr_preset_mode = preset_mode
-        self._handle_coordinator_update()
-
-    @property
-    def boost_fan_mode(self) -> int:
-        """Fan speed for boost mode
-
-        :return: maximum of supported fan_modes
-        """
-        return max([int(x) for x in self.fan_modes])
 
-    @property
-    def sleep_max_fan_mode(self) -> int:
-        """Maximum fan speed for sleep mode"""
-        return 2
+        # every successful set notifies coordinator listeners: write state once, when all actions are done
+        self._preset_changing = True
+        try:
+            if preset_mode == PRESET_AWAY and current != PRESET_AWAY:
+                _LOGGER.info("Going to AWAY mode. Will save target temperature %s", self.target_temperature)
+                self._saved_target_temp = self.target_temperature
+                await self._async_set_state(heater_temp=self._away_temp)
+
+            if preset_mode != PRESET_AWAY and current == PRESET_AWAY and self._saved_target_temp:
+                # retuning from away mode
+                _LOGGER.info("Returning from AWAY mode: will set saved temperature %s", self._saved_target_temp)
+                saved_target_temp, self._saved_target_temp = self._saved_target_temp, None
+                await self._async_set_state(heater_temp=saved_target_temp)
+
+            if preset_mode == PRESET_SLEEP and current != PRESET_SLEEP:
+                _LOGGER.info("Going to night mode: will save fan_speed: %s", self.fan_mode)
+                if self._saved_fan_mode is None and self.fan_mode is not None:
+                    self._saved_fan_mode = int(self.fan_mode)
+                await self.async_set_fan_mode(min(int(self.fan_mode or 1), self.sleep_max_fan_mode))
+
+            if preset_mode == PRESET_BOOST and not self._is_boost:
+                self._is_boost = True
+                if self._saved_fan_mode is None and self.fan_mode is not None:
+                    self._saved_fan_mode = int(self.fan_mode)
+                await self.async_set_fan_mode(self.boost_fan_mode)
+
+            if current in [PRESET_BOOST, PRESET_SLEEP] and preset_mode not in [PRESET_BOOST, PRESET_SLEEP]:
+                # returning from boost or sleep mode
+                _LOGGER.info("Returning from %s mode. Going to set fan speed %s", current, self._saved_fan_mode)
+                if current == PRESET_BOOST:
+                    self._is_boost = False
+
+                if self._saved_fan_mode is not None:
+                    saved_fan_mode, self._saved_fan_mode = self._saved_fan_mode, None
+                    await self.async_set_fan_mode(saved_fan_mode)
+        finally:
+            self._preset_changing = False
+            self._handle_coordinator_update()
 
     async def async_set_fan_mode(self, fan_mode):
         if self.preset_mode == PRESET_SLEEP:
             if int(fan_mode) > self.sleep_max_fan_mode:
                 _LOGGER.info("Fan speed %s was required, but I'm in SLEEP mode, so it should not be greater than %d",
-                             self.sleep_max_fan_mode)
+                             fan_mode, self.sleep_max_fan_mode)
                 fan_mode = self.sleep_max_fan_mode
 
         if (self.preset_mode == PRESET_BOOST and self._is_boost) and fan_mode != self.boost_fan_mode:
-            _LOGGER.debug("I'm in boost mode. Will ignore requested fan speed %s" % fan_mode)
+            _LOGGER.debug("I'm in boost mode. Will ignore requested fan speed %s", fan_mode)
             fan_mode = self.boost_fan_mode
-        if fan_mode != self.fan_mode or not self.coordinator.data.get("is_on"):
-            self._fan_speed = fan_mode
+        if self.fan_mode is None or int(fan_mode) != int(self.fan_mode) or not self.coordinator.data.get("is_on"):
             await self._async_set_state(fan_speed=fan_mode, is_on=True)
 
     async def async_set_temperature(self, **kwargs):
@@ -207,14 +208,13 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
-        self._target_temp = temperature
         await self._async_set_state(heater_temp=temperature)
 
     async def async_turn_on(self):
         """
         Turn breezer on. Tries to restore last state. Use HEAT as backup
         """
-        _LOGGER.debug(f"Turning on from {self.hvac_mode} to {self._last_mode}")
+        _LOGGER.debug("Turning on from %s to %s", self.hvac_mode, self._last_mode)
         if self.hvac_mode != HVACMode.OFF:
             # do nothing if we already working
             pass
@@ -224,7 +224,7 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
             await self.async_set_hvac_mode(self._last_mode)
 
     async def async_turn_off(self):
-        _LOGGER.debug(f"Turning off from {self.hvac_mode}")
+        _LOGGER.debug("Turning off from %s", self.hvac_mode)
         await self.async_set_hvac_mode(HVACMode.OFF)
 
     async def _async_set_state(self, **kwargs):
@@ -232,28 +232,51 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
         self._handle_coordinator_update()
 
     def _handle_coordinator_update(self) -> None:
+        if self._preset_changing:
+            return
         self._get_current_state()
         fan_mode = self.fan_mode
         if fan_mode is not None and int(fan_mode) != self.boost_fan_mode and (self._is_boost or self.preset_mode == PRESET_BOOST):
-            _LOGGER.warning(f"I'm in boost mode, but current speed {self.fan_mode} is not equal boost speed "
-                            f"{self.boost_fan_mode}. Dropping boost mode")
+            _LOGGER.warning("I'm in boost mode, but current speed %s is not equal boost speed %s. Dropping boost mode",
+                            self.fan_mode, self.boost_fan_mode)
             self._is_boost = False
             self._attr_preset_mode = PRESET_NONE
 
+        state = (
+            self._attr_hvac_mode,
+            self._attr_hvac_action,
+            self._attr_fan_mode,
+            self._attr_target_temperature,
+            self._attr_current_temperature,
+            self._attr_preset_mode,
+            self._attr_assumed_state,
+            self._in_temp,
+        )
+        if state == self._last_written_state:
+            # nothing changed since last write: keep-alive poll returned the same data
+            return
+        self._last_written_state = state
         self.async_write_ha_state()
 
     def _get_current_state(self):
-        self._attr_target_temperature = self.coordinator.data.get("heater_temp")
-        self._attr_current_temperature = self.coordinator.data.get("out_temp")
-        self._attr_fan_mode = self.coordinator.data.get("fan_speed")
-        self._attr_assumed_state = False if self.coordinator.last_update_success else True
-        self._attr_extra_state_attributes = {
-            'air_mode': self.coordinator.data.get("in_temp")  # left as-is to not change behavior beyond BLE
-        }
-        self._attr_hvac_mode = HVACMode.OFF if not self.coordinator.data.get("is_on") else \
-            HVACMode.HEAT if self.coordinator.data.get("heater") else HVACMode.FAN_ONLY
-        self._attr_hvac_action = HVACAction.OFF if not self.coordinator.data.get("is_on") else \
-            HVACAction.HEATING if self.coordinator.data.get("is_heating") else HVACAction.FAN
+        data = self.coordinator.data
+        is_on = data.get("is_on")
+        self._attr_target_temperature = data.get("heater_temp")
+        self._attr_current_temperature = data.get("out_temp")
+        fan_speed = data.get("fan_speed")
+        self._attr_fan_mode = None if fan_speed is None else str(fan_speed)
+        self._attr_assumed_state = not self.coordinator.last_update_success
+        in_temp = data.get("in_temp")
+        if in_temp != self._in_temp or self._attr_extra_state_attributes is None:
+            # new dict only on change: HA compares attributes with previous state
+            self._in_temp = in_temp
+            self._attr_extra_state_attributes = {
+                'air_mode': in_temp  # left as-is to not change behavior beyond BLE
+            }
+        self._attr_hvac_mode = HVACMode.OFF if not is_on else \
+            HVACMode.HEAT if data.get("heater") else HVACMode.FAN_ONLY
+        self._attr_hvac_action = HVACAction.OFF if not is_on else \
+            HVACAction.HEATING if data.get("is_heating") else HVACAction.FAN
 
     @property
     def available(self) -> bool:
@@ -261,20 +284,9 @@ class TionClimateEntity(ClimateEntity, CoordinatorEntity):
         return True
 
     async def set_air_source(self, source: str):
-        _LOGGER.debug(f"set_air_source: {source}")
+        _LOGGER.debug("set_air_source: %s", source)
         await self.coordinator.set(mode=source)
 
-    @property
-    def fan_mode(self) -> str | None:
-        value = self._attr_fan_mode
-        if value is None:
-            return None
-        return str(value)
-
-    @property
-    def fan_modes(self) -> list[str] | None:
-        return [str(i) for i in self._attr_fan_modes]
-
     @classmethod
     def attr_fan_modes(cls) -> list[int] | None:
-        return cls._attr_fan_modes
+        return [int(i) for i in cls._attr_fan_modes]
@@ -5,18 +5,23 @@ import logging
 import datetime
 import asyncio
 
+from typing import TYPE_CHECKING
+
 import bleak
-import tion_btle
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback, async_get_hass
-from tion_btle.tion import Tion
 
+from . import breezer_class
 from .const import DOMAIN, TION_SCHEMA, CONF_MAC
 
+if TYPE_CHECKING:
+    import tion_btle
+    from tion_btle.tion import Tion
+
 _LOGGER = logging.getLogger(__name__)
 
 TION_OPTIONS_SCHEMA = TION_SCHEMA.copy()
@@ -81,17 +86,8 @@ class TionFlow:
 
     @property
     def config(self) -> dict:
-        try:
-            data = dict(self._config_entry.data or {})
-        except AttributeError:
-            data = {}
-
-        try:
-            options = self._config_entry.options or {}
-            data.update(options)
-        except AttributeError:
-            pass
-        return data
+        entry = self._config_entry
+        return {**(getattr(entry, "data", None) or {}), **(getattr(entry, "options", None) or {})}
 
     @staticmethod
     def getTion(model: str, mac: str) -> tion_btle.TionS3 | tion_btle.TionLite | tion_btle.TionS4:
@@ -99,18 +95,10 @@ class TionFlow:
         btle_device = bluetooth.async_ble_device_from_address(hass=async_get_hass(), address=mac, connectable=True)
         if btle_device is None:
             message = f"Could not find device with {mac=}"
-            _LOGGER.critical(f"getTion: {message}")
+            _LOGGER.critical("getTion: %s", message)
             raise bleak.BleakError(message)
 
-        if model == 'S3':
-            from tion_btle.s3 import TionS3 as Breezer
-        elif model == 'S4':
-            from tion_btle.s4 import TionS4 as Breezer
-        elif model == 'Lite':
-            from tion_btle.lite import TionLite as Breezer
-        else:
-            raise NotImplementedError("Model '%s' is not supported!" % model)
-        return Breezer(btle_device)
+        return breezer_class(model)(btle_device)
 
 
 class TionConfigFlow(TionFlow, config_entries.ConfigFlow, domain=DOMAIN):
@@ -142,13 +130,13 @@ class TionConfigFlow(TionFlow, config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.debug("Showing pair info")
                 return self.async_show_form(step_id="pair")
             else:
-                _LOGGER.debug("Going create entry with name %s" % input['name'])
+                _LOGGER.debug("Going create entry with name %s", input['name'])
                 _LOGGER.debug(input)
                 try:
                     _tion: Tion = self.getTion(input['model'], input['mac'])
                     result = _tion.get()
                 except Exception as e:
-                    _LOGGER.error("Could not get data from breezer. result is %s, error: %s" % (result, str(e)))
+                    _LOGGER.error("Could not get data from breezer. result is %s, error: %s", result, e)
                     return self.async_show_form(step_id='add_failed')
 
                 return await self._create_entry(title=input['name'], data=input, step="user")
@@ -17,7 +17,9 @@ CONF_KEEP_ALIVE = "keep_alive"
 CONF_INITIAL_HVAC_MODE = "initial_hvac_mode"
 CONF_AWAY_TEMP = "away_temp"
 CONF_MAC = "mac"
-PLATFORMS = [Platform.SENSOR, Platform.CLIMATE, Platform.SELECT, Platform.FAN]
+CONF_SERIALIZE_ADAPTER = "serialize_adapter"
+CONF_FRESH_TTL = "fresh_ttl"
+PLATFORMS: tuple[Platform, ...] = (Platform.SENSOR, Platform.CLIMATE, Platform.SELECT, Platform.FAN)
 SUPPORTED_DEVICES = ['S3', 'S4', 'Lite']
 
 TION_SCHEMA = {
@@ -26,5 +28,7 @@ TION_SCHEMA = {
     CONF_MAC: {'type': str, 'required': True},
     CONF_KEEP_ALIVE: {'type': int, 'default': 60, 'required': False},
     CONF_AWAY_TEMP: {'type': int, 'default': 15, 'required': False},
+    CONF_FRESH_TTL: {'type': int, 'required': False},
+    CONF_SERIALIZE_ADAPTER: {'type': bool, 'default': False, 'required': False},
     'pair': {'type': bool, 'default': True, 'required': False},
 }
\ No newline at end of file
@@ -36,7 +36,7 @@ config = FanEntityDescription(
 async def async_setup_entry(hass: HomeAssistant, _config: ConfigEntry, async_add_entities):
     """Set up the sensor entry"""
 
-    async_add_entities([TionFan(config, hass.data[DOMAIN][_config.unique_id], hass)])
+    async_add_entities([TionFan(config, hass.data[DOMAIN][_config.entry_id], hass)])
     return True
 
 
@@ -101,8 +101,9 @@ class TionFan(FanEntity, CoordinatorEntity):
         self._attr_unique_id = f"{instance.unique_id}-{description.key}"
         self._saved_fan_mode = None
 
-        _LOGGER.debug(f"Init of fan  {self.name} ({instance.unique_id})")
-        _LOGGER.debug(f"Speed step is {self.percentage_step}")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Init of fan  %s (%s)", self.name, instance.unique_id)
+            _LOGGER.debug("Speed step is %s", self.percentage_step)
 
         registry = async_get_entity_registry(hass=hass)
         entity = registry.async_get_or_create(
@@ -110,11 +111,12 @@ class TionFan(FanEntity, CoordinatorEntity):
             platform=DOMAIN,
             unique_id=self.unique_id,
         )
-        _LOGGER.debug(f"{entity.entity_category=}, {entity.entity_id=}, {entity.options=} {entity.unique_id=}")
+        _LOGGER.debug("entity.entity_category=%r, entity.entity_id=%r, entity.options=%r entity.unique_id=%r",
+                      entity.entity_category, entity.entity_id, entity.options, entity.unique_id)
         if entity.entity_category == EntityCategory.CONFIG:
             import attr  # pylint: disable=import-outside-toplevel
 
-            _LOGGER.debug(f"Updating {entity.entity_category=} for {entity.entity_id=}")
+            _LOGGER.debug("Updating entity.entity_category=%r for entity.entity_id=%r", entity.entity_category, entity.entity_id)
             new_value = {"entity_category": None}
             registry.entities[entity.entity_id] = attr.evolve(registry.entities[entity.entity_id], **new_value)
             registry.async_schedule_save()
@@ -124,8 +126,8 @@ class TionFan(FanEntity, CoordinatorEntity):
         try:
             return self._percent_mode_mapping[percentage]
         except KeyError:
-            _LOGGER.warning(f"Could not to convert {percentage} to mode with {self._percent_mode_mapping}. "
-                            f"Will use fall back method.")
+            _LOGGER.warning("Could not to convert %s to mode with %s. Will use fall back method.",
+                            percentage, self._percent_mode_mapping)
             for i in range(len(TionClimateEntity.attr_fan_modes())):
                 if percentage < self.percentage_step * i:
                     break
@@ -2,6 +2,7 @@ from homeassistant.components.select import SelectEntityDescription, SelectEntit
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import TionInstance
@@ -18,9 +19,9 @@ INPUT_SELECTS: tuple[SelectEntityDescription, ...] = (
 )
 
 
-async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry, async_add_entities):
-    """Set up the sensor entry"""
-    tion_instance = hass.data[DOMAIN][config.unique_id]
+async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback):
+    """Set up the select entry"""
+    tion_instance = hass.data[DOMAIN][config.entry_id]
     entities: list[TionInputSelect] = [
         TionInputSelect(description, tion_instance, hass) for description in INPUT_SELECTS]
     async_add_entities(entities)
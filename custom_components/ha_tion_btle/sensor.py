@@ -2,6 +2,7 @@
 Sensors for Tion breezers
 """
 import logging
+import operator
 from datetime import timedelta
 
 from homeassistant.components.sensor import SensorEntityDescription, SensorDeviceClass, SensorStateClass, SensorEntity
@@ -62,6 +63,13 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
 )
 
 
+# sensors whose state is not just a copy of coordinator data field
+_VALUE_EXTRACTORS = {
+    # zero fan speed if breezer turned off
+    "fan_speed": lambda data: data.get("fan_speed") if data.get("is_on") else 0,
+}
+
+
 async def async_setup_platform(_hass: HomeAssistant, _config, _async_add_entities, _discovery_info=None):
     _LOGGER.critical("Sensors configuration via configuration.yaml is not supported!")
     return False
@@ -69,7 +77,7 @@ async def async_setup_platform(_hass: HomeAssistant, _config, _async_add_entitie
 
 async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry, async_add_entities):
     """Set up the sensor entry"""
-    tion_instance = hass.data[DOMAIN][config.unique_id]
+    tion_instance = hass.data[DOMAIN][config.entry_id]
     entities: list[TionSensor] = [
         TionSensor(description, tion_instance) for description in SENSOR_TYPES]
     async_add_entities(entities)
@@ -91,20 +99,14 @@ class TionSensor(SensorEntity, CoordinatorEntity):
         self._attr_name = f"{instance.name} {description.name}"
         self._attr_device_info = instance.device_info
         self._attr_unique_id = f"{instance.unique_id}-{description.key}"
+        self._extract = _VALUE_EXTRACTORS.get(description.key) or operator.methodcaller("get", description.key)
 
-        _LOGGER.debug(f"Init of sensor {self.name} ({instance.unique_id})")
+        _LOGGER.debug("Init of sensor %s (%s)", self.name, instance.unique_id)
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        value = self.coordinator.data.get(self.entity_description.key)
-
-        if self.entity_description.key == "fan_speed":
-            if not self.coordinator.data.get("is_on"):
-                # return zero fan speed if breezer turned off
-                value = 0
-
-        return value
+        return self._extract(self.coordinator.data)
 
     def _handle_coordinator_update(self) -> None:
         self._attr_assumed_state = False if self.coordinator.last_update_success else True